@@ -1,18 +1,219 @@
 import os
 import glob
+import hashlib
+import collections
 import concurrent.futures
+import errno
+import itertools
 import subprocess
 import sys
 import zipfile
 import json
+import mmap
 import threading
 import shutil
+import stat
 import tempfile
+import time
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from queue import Queue
+from queue import Queue, SimpleQueue, Empty
+import multiprocessing
 import re
+import shlex
+import zlib
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# 扫描项目文件时跳过的目录
+EXCLUDE_DIRS = {'moc_temp', 'build', 'obj', 'dist', 'venv'}
+
+# 打包时不再压缩的文件类型（本身已压缩或压缩率很低）
+INCOMPRESSIBLE = {'.dll', '.exe', '.png', '.jpg', '.jpeg', '.zip', '.7z', '.qm', '.ico'}
+
+# 超过该大小的文件不整体读入内存并行压缩，而是交给zipfile分块流式写入
+LARGE_FILE_SIZE = 64 * 1024 * 1024
+
+
+def _run_command(cmd, verbose, **kwargs):
+    # 非详细模式下直接丢弃输出，失败时再捕获输出重新执行一次以显示错误信息
+    if not verbose:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+        if result.returncode == 0:
+            return 0, ''
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        **kwargs
+    )
+    return result.returncode, result.stdout
+
+
+def _compile_batch(obj_dir, sources, compile_cmd, verbose):
+    # 在子进程中执行，不能直接打印（GUI日志重定向只在主进程生效）
+    # 一次g++调用编译多个源文件：不指定-o时.o写入当前目录，因此在对象文件目录中执行
+    os.makedirs(obj_dir, exist_ok=True)
+    returncode, output = _run_command(compile_cmd + tuple(sources), verbose, cwd=obj_dir)
+
+    # 回传全部输出（非详细模式下只有失败时才有输出），由主进程统一打印
+    return returncode, output.splitlines()
+
+
+def _is_up_to_date(obj, src, cmd_hash):
+    # 编译命令（C++标准、包含路径等）与生成对象文件时不同则必须重新编译
+    # 再根据g++ -MMD生成的.d依赖文件判断对象文件是否比源文件及其头文件都新
+    dep_file = os.path.splitext(obj)[0] + '.d'
+    try:
+        with open(obj + '.cmd', 'r', encoding='utf-8') as f:
+            if f.read().strip() != cmd_hash:
+                return False
+        obj_mtime = os.stat(obj).st_mtime_ns
+        with open(dep_file, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+    except OSError:
+        return False
+
+    # 依赖文件格式: foo.o: foo.cpp a.h \
+    #  b.h（路径中的空格会被转义为"\ "）
+    content = content.replace('\\\n', ' ')
+    deps = re.split(r'(?<!\\)\s+', content.partition(': ')[2])
+    obj_dir = os.path.dirname(obj)
+    try:
+        for dep in [src, *(d.replace('\\ ', ' ') for d in deps if d)]:
+            if os.stat(os.path.join(obj_dir, dep)).st_mtime_ns > obj_mtime:
+                return False
+    except OSError:
+        # 依赖的头文件已被删除或移动
+        return False
+    return True
+
+
+def _is_reparse_point(entry):
+    # NTFS目录联接（junction）不是符号链接，is_dir(follow_symlinks=False)仍返回True，需单独检查
+    if os.name != 'nt':
+        return entry.is_symlink()
+    return bool(entry.stat(follow_symlinks=False).st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _run_moc(moc_path, header_path, output_path):
+    # 在子进程中执行，输出回传给主进程打印
+    result = subprocess.run(
+        [moc_path, header_path, '-o', output_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True
+    )
+    return result.returncode, result.stdout
+
+
+def _has_q_object(header_path):
+    # 以字节方式映射文件查找Q_OBJECT，避免读取整个文件并做UTF-8解码
+    with open(header_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:  # 空文件无法mmap
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b'Q_OBJECT') != -1
+
+
+def _zip_compress_type(src_path):
+    # 压缩率很低的文件直接存储，不浪费CPU
+    if os.path.splitext(src_path)[1].lower() in INCOMPRESSIBLE:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _compress_file(src_path):
+    # 读取并压缩单个文件，返回(压缩方式, CRC, 原始大小, 压缩数据)
+    with open(src_path, 'rb') as f:
+        data = f.read()
+    crc = zlib.crc32(data)
+    if _zip_compress_type(src_path) == zipfile.ZIP_STORED:
+        return zipfile.ZIP_STORED, crc, len(data), data
+    # zip中存放的是不带zlib头的raw deflate数据
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed = compressor.compress(data) + compressor.flush()
+    return zipfile.ZIP_DEFLATED, crc, len(data), compressed
+
+
+def _write_compressed_entry(z, src_path, arcname, compress_type, crc, file_size, compressed):
+    # zipfile不支持直接写入已压缩的数据，这里按ZipFile._open_to_write的流程
+    # 手动写入本地文件头和数据，中央目录仍由ZipFile.close()生成
+    zinfo = zipfile.ZipInfo.from_file(src_path, arcname)
+    zinfo.compress_type = compress_type
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(compressed)
+
+    z.fp.seek(z.start_dir)
+    zinfo.header_offset = z.fp.tell()
+    z._writecheck(zinfo)
+    z._didModify = True
+    z.fp.write(zinfo.FileHeader())
+    z.fp.write(compressed)
+    z.start_dir = z.fp.tell()
+    z.filelist.append(zinfo)
+    z.NameToInfo[zinfo.filename] = zinfo
+
+
+def _move_file(src, dst):
+    # 同一文件系统内直接重命名，跨文件系统时才回退到拷贝
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
+def _acquire_build_lock(lock_path):
+    # 对共享的obj/和moc_temp/加文件锁，同一目录下的并发构建依次执行
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    lock_file = open(lock_path, 'a+b')
+    try:
+        lock_file.seek(0)
+        if not _try_lock(lock_file, blocking=False):
+            print("其他构建正在使用该目录，等待其完成...")
+            _try_lock(lock_file, blocking=True)
+    except Exception:
+        lock_file.close()
+        raise
+    return lock_file
+
+
+def _try_lock(lock_file, blocking):
+    if os.name == 'nt':
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                # msvcrt没有无限期等待的锁，短暂休眠后重试
+                time.sleep(0.5)
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _release_build_lock(lock_file):
+    try:
+        if os.name == 'nt':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
 
 class QtProjectBuilder:
     def __init__(self, config):
@@ -179,9 +380,15 @@ class QtProjectBuilder:
         print(f"Qt路径: {self.config['qt_path']}")
         print(f"编译模式: {'静态' if self.config.get('static_build') else '动态'}链接")
         
+        # moc和编译阶段共用一个进程池，避免每个阶段重复创建工作进程
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=self._get_max_jobs())
+        lock_file = None
         try:
-            moc_files = self._generate_moc_files()
-            objects = self._compile_sources(moc_files)
+            # 后启动的构建等待前一个完成，再通过增量编译直接复用其对象文件
+            lock_file = _acquire_build_lock(os.path.join('obj', '.lock'))
+            headers, cpp_files = self._scan_project(self.config.get('project_path', '.'))
+            moc_files = self._generate_moc_files(headers, pool)
+            objects = self._compile_sources(headers, cpp_files, moc_files, pool)
             exe_path = self._link_executable(objects)
             
             if self.config.get('pack_after_build'):
@@ -192,137 +399,210 @@ class QtProjectBuilder:
             print(f"构建失败: {str(e)}")
             return False
         finally:
+            pool.shutdown()
+            if lock_file is not None:
+                _release_build_lock(lock_file)
             print(f"总耗时: {datetime.now() - start_time}")
 
-    def _generate_moc_files(self):
-        project_path = self.config.get('project_path', '.')
+    def _get_max_jobs(self):
+        # 并行数默认不超过8，避免头文件I/O成为瓶颈时过度并行
+        return int(self.config.get('max_compile_jobs') or min(os.cpu_count() or 4, 8))
+
+    def _scan_project(self, project_path):
+        # 一次遍历同时收集头文件和源文件，供moc生成和编译阶段共用
+        headers = []
+        cpp_files = []
+        stack = [project_path]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDE_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(('.h', '.hpp')):
+                        headers.append(entry.path)
+                    elif entry.name.endswith('.cpp'):
+                        cpp_files.append(entry.path)
+        return headers, cpp_files
+
+    def _generate_moc_files(self, headers, pool):
         moc_files = []
+        pairs = []  # (头文件, moc输出文件)
         moc_path = f"{self.config['qt_path']}/bin/moc.exe"
         # moc_output_dir = os.path.join(project_path, 'moc_temp')  # 新增moc临时目录
         moc_output_dir = os.path.join(".\\", 'moc_temp')  # 新增moc临时目录
-        
-        # 清空并创建moc临时目录
-        if os.path.exists(moc_output_dir):
-            shutil.rmtree(moc_output_dir)
         os.makedirs(moc_output_dir, exist_ok=True)
 
-        # 修改为递归查找所有子目录的.h文件
-        for root, _, files in os.walk(project_path):
-            # 跳过moc临时目录
-            if root.startswith(moc_output_dir):
+        # 缓存每个头文件的mtime、是否含Q_OBJECT及moc输出的mtime，未改动的头文件无需重新扫描和生成
+        cache_file = os.path.join(moc_output_dir, '.moc_cache.json')
+        cache = self._load_moc_cache(cache_file, moc_path)
+        new_cache = {}
+        reused = 0
+
+        for header_path in headers:
+            if not header_path.endswith('.h'):
                 continue
-                
-            for header in files:
-                if header.endswith('.h'):
-                    header_path = os.path.join(root, header)
-                    with open(header_path, 'r', encoding='utf-8') as f:
-                        if 'Q_OBJECT' in f.read():
-                            base_name = os.path.splitext(header)[0]
-                            moc_file = f'moc_{base_name}.cpp'
-                            # 将生成的moc文件统一存放到临时目录
-                            output_path = os.path.join(moc_output_dir, moc_file)
-                            subprocess.run([moc_path, header_path, '-o', output_path], check=True)
-                            moc_files.append(output_path)
-                            print(f'生成moc文件: {output_path}')
+            mtime = os.stat(header_path).st_mtime_ns
+            entry = cache.get(header_path)
+            if entry is None or entry['mtime'] != mtime:
+                entry = {'mtime': mtime, 'q_object': _has_q_object(header_path)}
+            new_cache[header_path] = entry
+            if not entry['q_object']:
+                continue
+
+            base_name = os.path.splitext(os.path.basename(header_path))[0]
+            moc_file = f'moc_{base_name}.cpp'
+            # 将生成的moc文件统一存放到临时目录
+            output_path = os.path.join(moc_output_dir, moc_file)
+            try:
+                moc_mtime = os.stat(output_path).st_mtime_ns
+            except OSError:
+                moc_mtime = None
+            if entry.get('moc_out') == output_path and entry.get('moc_mtime') == moc_mtime:
+                moc_files.append(output_path)
+                reused += 1
+                continue
+            pairs.append((header_path, output_path))
+
+        # 清理已不再需要的moc文件
+        expected = {os.path.basename(p) for p in moc_files} | {os.path.basename(out) for _, out in pairs}
+        for name in os.listdir(moc_output_dir):
+            if name.startswith('moc_') and name.endswith('.cpp') and name not in expected:
+                os.remove(os.path.join(moc_output_dir, name))
+
+        if reused:
+            print(f"[MOC][跳过] {reused} 个头文件未修改，复用已有moc文件")
+
+        if pairs:
+            # 各头文件的moc互不依赖，使用进程池并行生成，完成后统一打印
+            results = list(pool.map(_run_moc, itertools.repeat(moc_path), *zip(*pairs)))
+
+            for (header_path, output_path), (returncode, output) in zip(pairs, results):
+                if returncode != 0:
+                    print(f"[MOC][失败] {header_path}\n{output.strip()}")
+                    raise subprocess.CalledProcessError(returncode, [moc_path, header_path, '-o', output_path])
+                new_cache[header_path]['moc_out'] = output_path
+                new_cache[header_path]['moc_mtime'] = os.stat(output_path).st_mtime_ns
+                moc_files.append(output_path)
+                print(f'生成moc文件: {output_path}')
+
+        self._save_moc_cache(cache_file, moc_path, new_cache)
         return moc_files
+
+    def _load_moc_cache(self, cache_file, moc_path):
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # 更换了Qt版本时缓存失效
+        if data.get('moc_path') != moc_path:
+            return {}
+        return data.get('headers', {})
+
+    def _save_moc_cache(self, cache_file, moc_path, headers):
+        tmp_file = cache_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'moc_path': moc_path, 'headers': headers}, f, indent=2)
+        os.replace(tmp_file, cache_file)
     
-    def _compile_sources(self, moc_files):
+    def _compile_sources(self, headers, cpp_files, moc_files, pool):
         project_path = self.config.get('project_path', '.')
 
-        # 新增自动检测源码目录
-        source_dirs = set()
-        exclude_dirs = {'moc_temp', 'build', 'obj', 'dist', 'venv'}
-        for root, dirs, files in os.walk(project_path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]  # 过滤排除目录
-            if any(f.endswith(('.h', '.hpp', '.cpp')) for f in files):
-                source_dirs.add(root)
+        # 自动检测源码目录（包含头文件或源文件的目录）
+        source_dirs = {os.path.dirname(f) for f in headers + cpp_files}
 
-        compile_cmd = [
+        # 批量编译时g++在对象文件目录中运行，包含路径需使用绝对路径
+        qt_include = os.path.abspath(os.path.join(self.config["qt_path"], 'include'))
+        compile_cmd = (
         'g++', '-c', '-pipe',
+        '-MMD',  # 生成.d依赖文件用于增量编译
         f'-std={self.config.get("cxx_std", "c++17")}',
         '-Wall', '-Wextra',
-        f'-I{self.config["qt_path"]}/include',
-        # 自动添加检测到的源码目录
-        *[f'-I{d}' for d in source_dirs],
-        *[f'-I{self.config["qt_path"]}/include/Qt{module}' 
-        for module in self.qt_modules]
-        ]
-
-        # 查找源文件（保持原有逻辑）
-        cpp_files = []
-        exclude_dirs = {'moc_temp', 'build', 'obj'}
-        for root, dirs, files in os.walk(project_path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            for file in files:
-                if file.endswith('.cpp'):
-                    cpp_files.append(os.path.join(root, file))
+        f'-I{qt_include}',
+        # 自动添加检测到的源码目录（排序使命令在多次构建间保持一致，增量编译依赖命令哈希）
+        *[f'-I{os.path.abspath(d)}' for d in sorted(source_dirs)],
+        *[f'-I{qt_include}/Qt{module}' 
+        for module in sorted(self.qt_modules)]
+        )
 
-        all_sources = list(set(cpp_files + moc_files))
-        print(f"[{datetime.now()}] 开始多线程编译，共 {len(all_sources)} 个源文件")
+        # 保持源文件顺序去重，使对象文件顺序（链接顺序）在多次构建间保持一致
+        all_sources = list(dict.fromkeys(cpp_files + moc_files))
+        print(f"[{datetime.now()}] 开始多进程编译，共 {len(all_sources)} 个源文件")
 
-        lock = threading.Lock()
+        # 按对象文件目录分组，同一目录的源文件可以合并到一次g++调用中
+        # 编译命令未变且对象文件比源文件和依赖的头文件都新时跳过编译
+        cmd_hash = hashlib.sha1('\0'.join(compile_cmd).encode('utf-8')).hexdigest()
         objects = []
-        failed_flag = False
-
-        # 合并后的编译处理函数
-        def compile_task(src):
-            nonlocal failed_flag
-            if failed_flag:
-                return None
-
-            # 创建对象文件目录
-            base_name = os.path.splitext(os.path.basename(src))[0]
+        groups = {}
+        for src in all_sources:
             obj_dir = os.path.join('obj', os.path.relpath(os.path.dirname(src), project_path))
-            os.makedirs(obj_dir, exist_ok=True)
+            base_name = os.path.splitext(os.path.basename(src))[0]
             obj = os.path.join(obj_dir, f'{base_name}.o')
+            objects.append(obj)
+            if not _is_up_to_date(obj, os.path.abspath(src), cmd_hash):
+                # 先删除旧的命令记录，编译失败时部分生成的对象文件不会被误认为有效
+                if os.path.exists(obj + '.cmd'):
+                    os.remove(obj + '.cmd')
+                groups.setdefault(obj_dir, []).append(os.path.abspath(src))
 
-            # 记录开始编译
-            with lock:
-                print(f"[G++][开始] 编译 {os.path.relpath(src, project_path)}")
-                print(f"[G++][命令] {' '.join(compile_cmd + ['-o', obj, src])}")
-
-            # 执行编译命令并捕获输出
-            process = subprocess.Popen(
-                [*compile_cmd, '-o', obj, src],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True
-            )
-
-            # 实时输出处理
-            output_buffer = []
-            while True:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    with lock:
-                        print(f"[G++][输出] {os.path.basename(src)}: {line.strip()}")
-                    output_buffer.append(line.strip())
-
-            # 处理编译结果
-            if process.returncode != 0:
-                with lock:
-                    print(f"[G++][失败] {src}\n错误输出:\n" + '\n'.join(output_buffer[-3:]))
-                    failed_flag = True
-                return None
-
-            with lock:
-                objects.append(obj)
-                print(f"[G++][完成] {src} -> {os.path.relpath(obj, project_path)}")
-            return obj
-
-        # 创建线程池执行任务
-        max_workers = min(os.cpu_count() or 4, len(all_sources))
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(compile_task, src): src for src in all_sources}
-            try:
-                for future in concurrent.futures.as_completed(futures):
-                    if future.exception():
-                        raise future.exception()
-            except Exception as e:
-                executor.shutdown(wait=False)
-                raise
+        stale_count = sum(len(sources) for sources in groups.values())
+        if stale_count < len(all_sources):
+            print(f"[G++][跳过] {len(all_sources) - stale_count} 个源文件未修改，需编译 {stale_count} 个")
+
+        # 批次数约为并行数的2倍，减少g++进程启动次数的同时保持负载均衡
+        batch_size = max(1, -(-stale_count // (2 * self._get_max_jobs())))
+        batches = []
+        for obj_dir, sources in groups.items():
+            it = iter(sources)
+            for batch in iter(lambda: list(itertools.islice(it, batch_size)), []):
+                batches.append((obj_dir, batch))
+
+        failed_flag = False
+        verbose = self.config.get('verbose')
+
+        # 提交到共享进程池执行，结果汇总到主进程处理
+        futures = {
+            pool.submit(_compile_batch, obj_dir, batch, compile_cmd, verbose): (obj_dir, batch)
+            for obj_dir, batch in batches
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                if future.cancelled():
+                    continue
+                obj_dir, batch = futures[future]
+                returncode, output = future.result()
+                names = ', '.join(os.path.basename(src) for src in batch)
+                if verbose:
+                    print(f"[G++][命令] {shlex.join(compile_cmd + tuple(batch))}")
+                    if output:
+                        print('\n'.join(f"[G++][输出] {line}" for line in output))
+                if returncode != 0:
+                    # 一个批次包含多个文件，g++遇到错误后仍会继续编译后面的文件，
+                    # 因此打印完整输出，并从"文件:行:列: error:"中找出真正出错的源文件
+                    failed = [os.path.basename(src) for src in batch
+                              if any(line.startswith(f"{src}:") and 'error' in line for line in output)]
+                    # 命令行只在失败时才拼接，避免每个批次都生成长字符串
+                    print(f"[G++][失败] {', '.join(failed) or names}\n"
+                          f"命令: {shlex.join(compile_cmd + tuple(batch))}")
+                    if not verbose:
+                        print("错误输出:\n" + '\n'.join(output))
+                    if not failed_flag:
+                        failed_flag = True
+                        # 出错后取消尚未开始的任务
+                        for f in futures:
+                            f.cancel()
+                    continue
+
+                for src in batch:
+                    base_name = os.path.splitext(os.path.basename(src))[0]
+                    with open(os.path.join(obj_dir, f'{base_name}.o.cmd'), 'w', encoding='utf-8') as f:
+                        f.write(cmd_hash)
+                print(f"[G++][完成] {names} -> {obj_dir}")
+        except Exception:
+            for f in futures:
+                f.cancel()
+            raise
 
         if failed_flag:
             raise RuntimeError("编译过程中出现错误，已终止构建")
@@ -347,32 +627,48 @@ class QtProjectBuilder:
             *objects,
             '-lz', '-lopengl32', '-lGLU32', '-lgdi32', '-luser32',
             *[f'-lQt{self.config.get("qt_version", 6)}{module}' 
-              for module in self.qt_modules],  # 使用检测后的模块列表
+              for module in sorted(self.qt_modules)],  # 使用检测后的模块列表
             '-lmingw32', '-ldwmapi'
         ]
+
+        # 链接命令未变且可执行文件比所有对象文件都新时跳过链接，
+        # 可执行文件的mtime保持不变，打包阶段才能识别出分发目录无变化
+        cmd_file = os.path.join('obj', f"{self.config.get('output_name', 'myapp')}.link.cmd")
+        cmd_hash = hashlib.sha1('\0'.join(link_cmd).encode('utf-8')).hexdigest()
+        if self._is_link_up_to_date(exe_name, objects, cmd_file, cmd_hash):
+            print(f"[LD][跳过] 对象文件未变化，沿用已有可执行文件: {exe_name}")
+            return exe_name
+        if os.path.exists(cmd_file):
+            os.remove(cmd_file)
+
         print(f"[LD][命令] {' '.join(link_cmd)}")
 
-        process = subprocess.Popen(
-            link_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True
-        )
+        verbose = self.config.get('verbose')
+        returncode, output = _run_command(link_cmd, verbose)
         
-        # 实时捕获链接输出
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                print(f"[LD] {output.strip()}")
-                
-        if process.returncode != 0:
-            raise subprocess.CalledProcessError(process.returncode, ' '.join(link_cmd))
+        # 一次性取回链接输出，详细模式或失败时打印
+        if verbose and output.strip():
+            print(f"[LD] {output.strip()}")
+        if returncode != 0:
+            if not verbose:
+                print(f"[LD][失败] 错误输出:\n{output.strip()}")
+            raise subprocess.CalledProcessError(returncode, ' '.join(link_cmd))
         
+        with open(cmd_file, 'w', encoding='utf-8') as f:
+            f.write(cmd_hash)
         print(f'成功生成可执行文件: {exe_name}')
         return exe_name
 
+    def _is_link_up_to_date(self, exe_name, objects, cmd_file, cmd_hash):
+        try:
+            with open(cmd_file, 'r', encoding='utf-8') as f:
+                if f.read().strip() != cmd_hash:
+                    return False
+            exe_mtime = os.stat(exe_name).st_mtime_ns
+            return all(os.stat(obj).st_mtime_ns <= exe_mtime for obj in objects)
+        except OSError:
+            return False
+
     def _get_link_options(self):
         opts = []
         if self.config.get('static_build'):
@@ -389,7 +685,7 @@ class QtProjectBuilder:
     def _package_build(self, exe_path):
         output_dir = os.path.dirname(exe_path)
         
-        # 使用Popen执行windeployqt并实时输出日志
+        # 执行windeployqt收集依赖
         deploy_cmd = [
             os.path.join(self.config['qt_path'], 'bin', 'windeployqt.exe'),
             '--dir', output_dir,
@@ -398,77 +694,141 @@ class QtProjectBuilder:
         ]
         
         try:
-            process = subprocess.Popen(
-                deploy_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True
-            )
+            verbose = self.config.get('verbose')
+            returncode, output = _run_command(deploy_cmd, verbose)
             
-            # 实时读取输出
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(f"[windeployqt] {output.strip()}")  # 已存在该日志前缀
-                    
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, deploy_cmd)
+            # 一次性取回输出，详细模式或失败时打印
+            if (verbose or returncode != 0) and output.strip():
+                print(f"[windeployqt] {output.strip()}")
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, deploy_cmd)
                 
         except Exception as e:
             print(f"依赖收集失败: {str(e)}")
             raise
 
-        # 创建临时目录打包
+        build_dir = os.path.join(self.config['project_path'], 'build')
+        os.makedirs(build_dir, exist_ok=True)
+        final_zip = os.path.join(
+            build_dir,
+            f"{os.path.basename(exe_path[:-4])}_full.zip"
+        )
+        # 一次遍历得到待压缩文件列表，总数直接用于进度显示
+        entries = self._collect_files(output_dir)
+
+        # 用文件大小和mtime作为指纹，与上次打包时记录的清单一致则无需重新打包
+        manifest_file = os.path.splitext(final_zip)[0] + '.manifest.json'
+        fingerprint = {}
+        for src_path, arcname in entries:
+            st = os.stat(src_path)
+            fingerprint[arcname] = [st.st_size, st.st_mtime_ns]
+        if self._is_package_unchanged(manifest_file, final_zip, fingerprint):
+            print(f"分发包无变化，跳过打包: {final_zip}")
+            return
+
+        # 可配置临时目录到内存盘或高速SSD（如 R:\ 或 /dev/shm），避免与输出目录争用同一磁盘；
+        # 未配置时直接在最终位置旁生成，完成后原子重命名，不需要额外拷贝整个压缩包
+        tmp_root = self.config.get('tmp_dir')
         try:
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                print(f"\n创建临时打包目录: {tmp_dir}")
-                
-                # 在临时目录创建压缩包
-                build_dir = os.path.join(self.config['project_path'], 'build')
-                os.makedirs(build_dir, exist_ok=True)
-                final_zip = os.path.join(
-                    build_dir,
-                    f"{os.path.basename(exe_path[:-4])}_full.zip"
-                )
-                tmp_zip = os.path.join(tmp_dir, 'build.zip')
-                # 计算总文件数用于进度显示
-                total_files = sum([len(files) for _, _, files in os.walk(output_dir)])
-                processed = 0
-                
-                with zipfile.ZipFile(tmp_zip, 'w', compression=zipfile.ZIP_DEFLATED) as z:
-                    for root, _, files in os.walk(output_dir):
-                        for file in files:
-                            src_path = os.path.join(root, file)
-                            if not os.path.isfile(src_path):  # 跳过符号链接等
-                                continue
-                                
-                            # 计算相对路径
-                            arcname = os.path.relpath(src_path, output_dir)
-                            print(f"正在压缩 ({processed+1}/{total_files}): {arcname}")
-                            z.write(src_path, arcname)
-                            processed += 1
-
-                # 移动压缩包到最终位置
-                if os.path.exists(final_zip):
-                    os.remove(final_zip)
-                shutil.move(tmp_zip, final_zip)
-
-                print(f"\n成功生成分发包: {final_zip}")
-                print(f"压缩包大小: {os.path.getsize(final_zip)/1024/1024:.2f} MB")
+            if tmp_root:
+                with tempfile.TemporaryDirectory(dir=tmp_root) as tmp_dir:
+                    print(f"\n创建临时打包目录: {tmp_dir}")
+                    tmp_zip = os.path.join(tmp_dir, 'build.zip')
+                    self._write_zip(tmp_zip, entries)
+                    # 移动压缩包到最终位置
+                    _move_file(tmp_zip, final_zip)
+            else:
+                tmp_zip = final_zip + '.tmp'
+                try:
+                    self._write_zip(tmp_zip, entries)
+                    os.replace(tmp_zip, final_zip)
+                finally:
+                    if os.path.exists(tmp_zip):
+                        os.remove(tmp_zip)
+
+            self._save_package_manifest(manifest_file, final_zip, fingerprint)
+            print(f"\n成功生成分发包: {final_zip}")
+            print(f"压缩包大小: {os.path.getsize(final_zip)/1024/1024:.2f} MB")
 
         except Exception as e:
             print(f"打包失败: {str(e)}")
             raise
+
+    def _is_package_unchanged(self, manifest_file, final_zip, fingerprint):
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            st = os.stat(final_zip)
+        except (OSError, ValueError):
+            return False
+        # 压缩包本身被替换或修改过时也需要重新打包
+        return (manifest.get('zip') == [st.st_size, st.st_mtime_ns]
+                and manifest.get('files') == fingerprint)
+
+    def _save_package_manifest(self, manifest_file, final_zip, fingerprint):
+        st = os.stat(final_zip)
+        tmp_file = manifest_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'zip': [st.st_size, st.st_mtime_ns], 'files': fingerprint}, f, indent=2)
+        os.replace(tmp_file, manifest_file)
+
+    def _write_zip(self, zip_path, entries):
+        total_files = len(entries)
+        max_workers = os.cpu_count() or 4
+        # 各文件在线程池中并行压缩（zlib压缩时释放GIL），主线程按顺序写入压缩包；
+        # 同时在途的文件数限制为线程数的2倍，避免整个输出目录的数据同时驻留内存
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as z, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = collections.deque()
+            remaining = iter(entries)
+
+            def submit(count):
+                for src_path, arcname in itertools.islice(remaining, count):
+                    if os.path.getsize(src_path) > LARGE_FILE_SIZE:
+                        future = None  # 大文件在写入时由zipfile流式压缩
+                    else:
+                        future = executor.submit(_compress_file, src_path)
+                    pending.append((src_path, arcname, future))
+
+            submit(2 * max_workers)
+            processed = 0
+            while pending:
+                src_path, arcname, future = pending.popleft()
+                processed += 1
+                print(f"正在压缩 ({processed}/{total_files}): {arcname}")
+                if future is None:
+                    z.write(src_path, arcname, compress_type=_zip_compress_type(src_path))
+                else:
+                    _write_compressed_entry(z, src_path, arcname, *future.result())
+                submit(1)
+
 # 新增辅助方法
+    def _collect_files(self, root_dir):
+        # 返回目录下所有文件的(完整路径, 压缩包内相对路径)列表
+        entries = []
+        stack = [root_dir]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():  # 跳过失效的符号链接等
+                        entries.append((entry.path, os.path.relpath(entry.path, root_dir)))
+        return entries
+
     def _get_dir_size(self, path):
+        # 用栈代替递归遍历；不跟随符号链接/重解析点，Windows下scandir已缓存文件大小
         total = 0
-        for entry in os.scandir(path):
-            if entry.is_file():
-                total += entry.stat().st_size
-            elif entry.is_dir():
-                total += self._get_dir_size(entry.path)
+        stack = [path]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if _is_reparse_point(entry):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
         return total
 
     def _clean_intermediates(self, moc_files):
@@ -477,14 +837,12 @@ class QtProjectBuilder:
             print(f'已清理临时文件: {f}')
             
 class TextRedirector:
-    def __init__(self, widget):
-        self.widget = widget
+    def __init__(self, log_queue):
+        self.log_queue = log_queue
 
     def write(self, text):
-        self.widget.configure(state='normal')
-        self.widget.insert(tk.END, text)
-        self.widget.see(tk.END)
-        self.widget.configure(state='disabled')
+        # 只把文本放入队列，不在构建线程中操作Tk控件，由主线程定时批量写入
+        self.log_queue.put(text)
 
     def flush(self):
         pass
@@ -512,8 +870,9 @@ class QtBuilderApp(tk.Tk):
         self.geometry("900x600")
         self._setup_ui()
         self.event_queue = Queue()
+        self.log_queue = SimpleQueue()
         self.load_config()
-        sys.stdout = TextRedirector(self.log_area)
+        sys.stdout = TextRedirector(self.log_queue)
         self.after(100, self.check_queue)
 
     def _setup_ui(self):
@@ -558,27 +917,41 @@ class QtBuilderApp(tk.Tk):
         self.output_name = ttk.Entry(parent, width=30)
         self.output_name.grid(row=3, column=1, columnspan=2, sticky='ew')
 
+        # 打包临时目录（留空则直接在build目录中生成）
+        ttk.Label(parent, text="临时目录:").grid(row=4, column=0, sticky='w', pady=5)
+        self.tmp_dir = ttk.Entry(parent, width=30)
+        self.tmp_dir.grid(row=4, column=1)
+        ttk.Button(parent, text="浏览", width=8,
+                 command=lambda: self._select_path(self.tmp_dir)).grid(row=4, column=2)
+
         # 编译选项
-        ttk.Label(parent, text="C++标准:").grid(row=4, column=0, sticky='w', pady=5)
+        ttk.Label(parent, text="C++标准:").grid(row=5, column=0, sticky='w', pady=5)
         self.cxx_std = ttk.Combobox(parent, values=['c++11', 'c++14', 'c++17', 'c++20'], width=8)
-        self.cxx_std.grid(row=4, column=1, sticky='w')
+        self.cxx_std.grid(row=5, column=1, sticky='w')
+
+        # 并行编译数（留空默认为CPU核数，最多8）
+        ttk.Label(parent, text="编译并行数:").grid(row=6, column=0, sticky='w', pady=5)
+        self.max_compile_jobs = ttk.Spinbox(parent, from_=1, to=os.cpu_count() or 4, width=6)
+        self.max_compile_jobs.grid(row=6, column=1, sticky='w')
 
         # 构建选项
         self.static_build = tk.BooleanVar()
-        ttk.Checkbutton(parent, text="静态编译", variable=self.static_build).grid(row=5, column=0, sticky='w')
+        ttk.Checkbutton(parent, text="静态编译", variable=self.static_build).grid(row=7, column=0, sticky='w')
         self.pack_after_build = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="自动打包", variable=self.pack_after_build).grid(row=5, column=1)
+        ttk.Checkbutton(parent, text="自动打包", variable=self.pack_after_build).grid(row=7, column=1)
+        self.verbose = tk.BooleanVar()
+        ttk.Checkbutton(parent, text="详细日志", variable=self.verbose).grid(row=7, column=2)
 
         # 控制按钮
         btn_frame = ttk.Frame(parent)
         self.btn_build = ttk.Button(btn_frame, text="开始构建", command=self.start_build, state='normal')
         self.btn_build.pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="清理项目", command=self.clean_project).pack(side=tk.LEFT)
-        btn_frame.grid(row=6, column=0, columnspan=3, pady=15)
+        btn_frame.grid(row=8, column=0, columnspan=3, pady=15)
         ttk.Button(btn_frame, text="运行程序", command=self.run_program).pack(side=tk.LEFT, padx=5)
-        btn_frame.grid(row=6, column=0, columnspan=3, pady=15)
+        btn_frame.grid(row=8, column=0, columnspan=3, pady=15)
         ttk.Button(btn_frame, text="清理输出", command=self.clean_output).pack(side=tk.LEFT)  # 新增按钮
-        btn_frame.grid(row=6, column=0, columnspan=3, pady=15)
+        btn_frame.grid(row=8, column=0, columnspan=3, pady=15)
 
 
     def clean_output(self):
@@ -607,9 +980,12 @@ class QtBuilderApp(tk.Tk):
                 self.qt_path.insert(0, config.get('qt_path', ''))
                 self.output_dir.insert(0, config.get('output_dir', './dist'))
                 self.output_name.insert(0, config.get('output_name', 'myapp'))
+                self.tmp_dir.insert(0, config.get('tmp_dir', ''))
                 self.cxx_std.set(config.get('cxx_std', 'c++17'))
+                self.max_compile_jobs.set(config.get('max_compile_jobs') or '')
                 self.static_build.set(config.get('static_build', False))
                 self.pack_after_build.set(config.get('pack_after_build', True))
+                self.verbose.set(config.get('verbose', False))
         except FileNotFoundError:
             pass
 
@@ -620,11 +996,22 @@ class QtBuilderApp(tk.Tk):
                 'qt_path': self.qt_path.get(),
                 'output_dir': self.output_dir.get(),
                 'output_name': self.output_name.get(),
+                'tmp_dir': self.tmp_dir.get(),
                 'cxx_std': self.cxx_std.get(),
+                'max_compile_jobs': self._get_max_compile_jobs(),
                 'static_build': self.static_build.get(),
-                'pack_after_build': self.pack_after_build.get()
+                'pack_after_build': self.pack_after_build.get(),
+                'verbose': self.verbose.get()
             }, f, indent=2)
 
+    def _get_max_compile_jobs(self):
+        # 非正整数视为未设置，由构建器使用默认值
+        try:
+            jobs = int(self.max_compile_jobs.get())
+        except ValueError:
+            return None
+        return jobs if jobs > 0 else None
+
     def start_build(self):
         self.btn_build['state'] = 'disabled'
         self.save_config()
@@ -634,15 +1021,20 @@ class QtBuilderApp(tk.Tk):
             'qt_path': self.qt_path.get(),
             'output_dir': self.output_dir.get(),
             'output_name': self.output_name.get(),
+            'tmp_dir': self.tmp_dir.get(),
             'cxx_std': self.cxx_std.get(),
+            'max_compile_jobs': self._get_max_compile_jobs(),
             'static_build': self.static_build.get(),
             'pack_after_build': self.pack_after_build.get(),
+            'verbose': self.verbose.get(),
             'subsystem': 'windows'
         }
 
         BuildThread(config, self.event_queue).start()
 
     def check_queue(self):
+        # 先写入已有日志，保证弹出完成提示前日志已显示
+        pending = self._flush_log()
         while not self.event_queue.empty():
             msg_type, content = self.event_queue.get()
             if msg_type == 'done':
@@ -652,7 +1044,23 @@ class QtBuilderApp(tk.Tk):
                 messagebox.showerror("错误", content)
                 self.btn_build['state'] = 'normal'
             print(content)
-        self.after(100, self.check_queue)
+        # 日志积压时缩短刷新间隔，尽快追上构建线程的输出
+        self.after(10 if pending else 100, self.check_queue)
+
+    def _flush_log(self, max_items=256):
+        # 每次最多合并max_items条日志做一次插入，返回是否还有未写入的日志
+        chunks = []
+        while len(chunks) < max_items:
+            try:
+                chunks.append(self.log_queue.get_nowait())
+            except Empty:
+                break
+        if chunks:
+            self.log_area.configure(state='normal')
+            self.log_area.insert(tk.END, ''.join(chunks))
+            self.log_area.see(tk.END)
+            self.log_area.configure(state='disabled')
+        return not self.log_queue.empty()
 
     def clean_project(self):
         try:
@@ -705,5 +1113,6 @@ class QtBuilderApp(tk.Tk):
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # 打包为exe后子进程需要
     app = QtBuilderApp()
     app.mainloop()